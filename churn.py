@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+CLONES = Path(os.environ.get("UT_CLONES", "clones"))
+CHURN_CACHE = Path("media/churn")
+TESTS_DIR = "tests/"
+# Numbers shown on the slides when no local clone is available
+FALLBACK = {
+    "blastAMR": 25.0,
+    "openfoam-smartsim": 0.2,
+}
+
+
+def git(repo, *args):
+    return subprocess.run(["git", "-C", str(repo), *args], capture_output=True, text=True, check=True).stdout
+
+
+def parse_numstat(log):
+    lines = pd.Series(log.splitlines(), dtype=str)
+    lines = lines[lines != ""]
+    marker = lines.str.startswith("@")
+    commits = lines.where(marker).str[1:].ffill()
+    stats = lines[~marker].str.split("\t", n=2, expand=True)
+    if stats.empty:
+        return pd.DataFrame({"commit": [], "adds": [], "dels": [], "path": []})
+    # Binary files report "-" for both counts
+    return pd.DataFrame({
+        "commit": commits[~marker],
+        "adds": pd.to_numeric(stats[0], errors="coerce").fillna(0).astype("int64"),
+        "dels": pd.to_numeric(stats[1], errors="coerce").fillna(0).astype("int64"),
+        "path": stats[2],
+    }).reset_index(drop=True)
+
+
+def load_numstat(name, repo):
+    # Per-commit rows are cached, only commits after the cached head are parsed
+    CHURN_CACHE.mkdir(parents=True, exist_ok=True)
+    table, head_file = CHURN_CACHE / f"{name}.csv", CHURN_CACHE / f"{name}.head"
+    head = git(repo, "rev-parse", "HEAD").strip()
+    cached, since = None, None
+    if table.exists() and head_file.exists():
+        since = head_file.read_text().strip()
+        if since == head:
+            return pd.read_csv(table, keep_default_na=False)
+        ancestor = subprocess.run(["git", "-C", str(repo), "merge-base", "--is-ancestor", since, head]).returncode == 0
+        if ancestor:
+            cached = pd.read_csv(table, keep_default_na=False)
+        else:
+            since = None
+    revs = f"{since}..{head}" if since else head
+    # Without quotepath=off, paths with non-ASCII bytes come back C-quoted and miss the tests/ prefix
+    fresh = parse_numstat(git(repo, "-c", "core.quotepath=off", "log", "--numstat", "--no-renames", "--format=@%H", revs))
+    rows = fresh if cached is None else pd.concat([cached, fresh], ignore_index=True)
+    rows.to_csv(table, index=False)
+    head_file.write_text(head + "\n")
+    return rows
+
+
+def test_churn(rows, tests=TESTS_DIR):
+    changes = rows["adds"] + rows["dels"]
+    total = changes.sum()
+    return float(100.0 * changes[rows["path"].str.startswith(tests)].sum() / total) if total else 0.0
+
+
+def churn_stats(names=FALLBACK):
+    stats = {}
+    for name in names:
+        repo = CLONES / name
+        if (repo / ".git").exists():
+            stats[name] = test_churn(load_numstat(name, repo))
+        elif name in FALLBACK:
+            stats[name] = FALLBACK[name]
+        else:
+            print(f"{name}: no clone in {CLONES} and no fallback figure, skipped", file=sys.stderr)
+    return stats
+
+
+if __name__ == "__main__":
+    for name, ratio in churn_stats(sys.argv[1:] or FALLBACK).items():
+        print(f"{name}: {ratio:.3g}% git adds/dels for {TESTS_DIR}")
@@ -0,0 +1,133 @@
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+PRESENTATION = Path("slides/UnitTesting.json")
+STORE_DIR = Path("media/framestore")
+# Frames kept per slide: where it holds once played, and where it starts before its animations
+KEY_FRAMES = ("last", "first")
+
+
+def decode(file, kind, size):
+    w, h = size
+    # ffmpeg hands back a single frame: the first stops the decoder, the last seeks to the
+    # final second and has the image2 muxer overwrite its one output frame
+    seek = ["-sseof", "-1"] if kind == "last" else []
+    limit = ["-frames:v", "1"] if kind == "first" else []
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "frame.rgb"
+        subprocess.run([
+            "ffmpeg", "-v", "error", *seek, "-i", str(file), "-vf", f"scale={w}:{h}", *limit,
+            "-update", "1", "-f", "image2", "-c:v", "rawvideo", "-pix_fmt", "rgb24", str(out),
+        ], capture_output=True, check=True)
+        data = out.read_bytes() if out.exists() else b""
+    if len(data) != w * h * 3:
+        raise RuntimeError(f"could not decode the {kind} frame of {file}")
+    return np.frombuffer(data, np.uint8).reshape(h, w, 3)
+
+
+class FrameStore:
+    # Raw rgb24 frames in one file, paged in on demand; frame() returns views, never copies
+
+    def __init__(self, stem=STORE_DIR / "UnitTesting"):
+        self.index = json.loads(Path(f"{stem}.json").read_text())
+        w, h = self.index["resolution"]
+        self.frames = np.memmap(f"{stem}.frames", np.uint8, "r", shape=(self.index["count"], h, w, 3))
+
+    def __len__(self):
+        return len(self.index["slides"])
+
+    def frame(self, slide, kind="last"):
+        return self.frames[self.index["slides"][slide][kind]]
+
+    @classmethod
+    def build(cls, presentation=PRESENTATION, stem=STORE_DIR / "UnitTesting", size=None):
+        config = json.loads(Path(presentation).read_text())
+        size = tuple(size or config.get("resolution", (1920, 1080)))
+        previous = None
+        try:
+            previous = cls(stem)
+            if tuple(previous.index["resolution"]) != size:
+                previous = None
+        except (OSError, ValueError, KeyError):
+            pass
+        # Uncached renders reuse names (uncached_00000, ...), so a slide is only copied over
+        # from the previous store when its file still has the same size and mtime
+        reuse = {(s["file"], s.get("size"), s.get("mtime")): i for i, s in enumerate(previous.index["slides"])} if previous else {}
+        # Slide paths are stored relative to the folder holding slides/
+        files = [Path(presentation).parent.parent / s["file"] for s in config["slides"]]
+        count = len(files) * len(KEY_FRAMES)
+        Path(stem).parent.mkdir(parents=True, exist_ok=True)
+        w, h = size
+        # Frames go straight into the new store, never more than one decoded frame in memory
+        tmp = Path(f"{stem}.frames.tmp")
+        store = np.memmap(tmp, np.uint8, "w+", shape=(count, h, w, 3))
+        slides = []
+        for n, file in enumerate(files):
+            stat = file.stat()
+            entry = {"file": file.name, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+            old = reuse.get((file.name, stat.st_size, stat.st_mtime_ns))
+            for k, kind in enumerate(KEY_FRAMES):
+                entry[kind] = i = n * len(KEY_FRAMES) + k
+                store[i] = previous.frame(old, kind) if old is not None else decode(file, kind, size)
+            slides.append(entry)
+        store.flush()
+        del store, previous
+        tmp.replace(f"{stem}.frames")
+        Path(f"{stem}.json").write_text(json.dumps({"resolution": [w, h], "count": count, "slides": slides}))
+        return cls(stem)
+
+
+def present(store):
+    from qtpy.QtCore import Qt
+    from qtpy.QtGui import QImage, QPixmap
+    from qtpy.QtWidgets import QApplication, QLabel
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    label = QLabel()
+    label.setAlignment(Qt.AlignCenter)
+    label.setStyleSheet("background: black")
+    w, h = store.index["resolution"]
+    state = {"slide": 0, "kind": "last"}
+
+    def show():
+        frame = store.frame(state["slide"], state["kind"])
+        image = QImage(frame.data, w, h, 3 * w, QImage.Format_RGB888)
+        label.setPixmap(QPixmap.fromImage(image).scaled(label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+
+    def key_press(event):
+        # Slides are shown as they hold once played, B shows the current one before its animations
+        step = {Qt.Key_Right: 1, Qt.Key_Space: 1, Qt.Key_PageDown: 1, Qt.Key_Left: -1, Qt.Key_PageUp: -1}
+        if event.key() in step:
+            state["slide"] = min(max(state["slide"] + step[event.key()], 0), len(store) - 1)
+            state["kind"] = "last"
+        elif event.key() == Qt.Key_B:
+            state["kind"] = "first" if state["kind"] == "last" else "last"
+        elif event.key() == Qt.Key_Home:
+            state["slide"], state["kind"] = 0, "last"
+        elif event.key() == Qt.Key_End:
+            state["slide"], state["kind"] = len(store) - 1, "last"
+        elif event.key() in (Qt.Key_Q, Qt.Key_Escape):
+            label.close()
+            return
+        show()
+
+    label.keyPressEvent = key_press
+    label.resizeEvent = lambda event: show()
+    if "--full-screen" in sys.argv:
+        label.showFullScreen()
+    else:
+        label.resize(w // 2, h // 2)
+        label.show()
+    app.exec_()
+
+
+if __name__ == "__main__":
+    store = FrameStore.build()
+    print(f"{len(store)} slides, {store.frames.nbytes / 2**20:.1f} MiB in {STORE_DIR}")
+    if "--present" in sys.argv:
+        present(store)
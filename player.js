@@ -0,0 +1,143 @@
+// Plays the vector export of the deck (see vector.py) on a canvas behind reveal.js
+(function () {
+  var url = document.currentScript.getAttribute('data-deck');
+  var canvas = document.createElement('canvas');
+  var ctx = canvas.getContext('2d');
+  var deck = null, paths = [], images = [], lists = [];
+  var shown = -1, timer = null, current = 0;
+
+  // Frames are diffs against the previous frame of their slide (VectorRecorder.diff in
+  // vector.py): [paint, x, y, opacity] entries, or [-length, dx, dy, opacity|null] runs
+  // carrying over the entries at the same indices
+  function decode() {
+    deck.slides.forEach(function (slide) {
+      var previous = [];
+      for (var i = slide.start; i < slide.end; i++) {
+        var values = deck.frames[i][1], list = [];
+        for (var k = 0; k < values.length; k += 4) {
+          var head = values[k], dx = values[k + 1], dy = values[k + 2], opacity = values[k + 3];
+          if (head >= 0) {
+            list.push(values.slice(k, k + 4));
+            continue;
+          }
+          previous.slice(list.length, list.length - head).forEach(function (entry) {
+            list.push(dx || dy || opacity !== null
+              ? [entry[0], entry[1] + dx, entry[2] + dy, opacity === null ? entry[3] : opacity]
+              : entry);
+          });
+        }
+        lists[i] = previous = list;
+      }
+    });
+  }
+
+  function draw(index) {
+    var ratio = window.devicePixelRatio || 1;
+    var width = canvas.clientWidth * ratio, height = canvas.clientHeight * ratio;
+    if (canvas.width !== width || canvas.height !== height) {
+      canvas.width = width;
+      canvas.height = height;
+    }
+    shown = index;
+    var f = deck.frame, s = Math.min(width / f[0], height / f[1]);
+    var base = [s, 0, 0, -s, width / 2 - s * f[2], height / 2 + s * f[3]];
+    ctx.setTransform(1, 0, 0, 1, 0, 0);
+    ctx.fillStyle = deck.background;
+    ctx.fillRect(0, 0, width, height);
+    lists[index].forEach(function (entry) {
+      var paint = deck.paints[entry[0]];
+      ctx.setTransform.apply(ctx, base);
+      ctx.globalAlpha = entry[3];
+      if (paint[0] === null) {
+        var img = images[paint[1]], w = img.naturalWidth, h = img.naturalHeight;
+        ctx.transform(paint[2] / w, paint[3] / w, paint[4] / h, paint[5] / h, entry[1], entry[2]);
+        ctx.drawImage(img, 0, 0);
+        return;
+      }
+      var path = paths[paint[0]];
+      ctx.translate(entry[1], entry[2]);
+      // Same order as manim's cairo camera: background stroke, fill, stroke
+      if (paint[4]) {
+        ctx.strokeStyle = paint[4];
+        ctx.lineWidth = paint[5];
+        ctx.stroke(path);
+      }
+      if (paint[1]) {
+        ctx.fillStyle = paint[1];
+        ctx.fill(path);
+      }
+      if (paint[2]) {
+        ctx.strokeStyle = paint[2];
+        ctx.lineWidth = paint[3];
+        ctx.stroke(path);
+      }
+    });
+    ctx.globalAlpha = 1;
+  }
+
+  function stop() {
+    if (timer !== null) cancelAnimationFrame(timer);
+    timer = null;
+  }
+
+  function play(index) {
+    stop();
+    var slide = deck.slides[index], ends = [], total = 0;
+    for (var i = slide.start; i < slide.end; i++) {
+      total += deck.frames[i][0];
+      ends.push(total);
+    }
+    var rate = deck.fps * (slide.playback_rate || 1), start = performance.now();
+    function tick(now) {
+      var t = (now - start) / 1000 * rate, k = 0;
+      if (slide.loop) t %= total;
+      while (k < ends.length - 1 && ends[k] <= t) k++;
+      if (slide.start + k !== shown) draw(slide.start + k);
+      if (slide.loop || t < total) {
+        timer = requestAnimationFrame(tick);
+      } else {
+        timer = null;
+        if (slide.auto_next) Reveal.next();
+      }
+    }
+    timer = requestAnimationFrame(tick);
+  }
+
+  function show(index, backwards) {
+    var slide = deck.slides[index];
+    if (!slide) return;
+    current = index;
+    if (backwards) {
+      stop();
+      draw(slide.end - 1);
+    } else {
+      play(index);
+    }
+  }
+
+  function start() {
+    canvas.style.cssText = 'position:absolute;top:0;left:0;width:100%;height:100%';
+    document.querySelector('.reveal .backgrounds').appendChild(canvas);
+    show(Reveal.getIndices().h, false);
+    Reveal.on('slidechanged', function (event) {
+      show(event.indexh, event.indexh < current);
+    });
+    window.addEventListener('resize', function () {
+      if (shown >= 0) draw(shown);
+    });
+  }
+
+  fetch(url).then(function (response) { return response.json(); }).then(function (data) {
+    deck = data;
+    paths = deck.paths.map(function (d) { return new Path2D(d); });
+    decode();
+    return Promise.all(deck.images.map(function (src) {
+      var img = new Image();
+      img.src = src;
+      images.push(img);
+      return img.decode();
+    }));
+  }).then(function () {
+    if (Reveal.isReady()) start(); else Reveal.on('ready', start);
+  });
+})();
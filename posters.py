@@ -0,0 +1,63 @@
+import re
+import shutil
+import sys
+from pathlib import Path
+
+SLIDES_DIR = Path("slides/files/UnitTesting")
+VIDEO_ATTR = re.compile(r'data-background-video="(?P<assets>[^"]*/)(?P<stem>[^"/]+)\.mp4"')
+
+POSTER_SCRIPT = """    <script>
+      // Show the first/last rendered frame while a slide's video is still loading
+      function applyPosters(backwards) {
+        Reveal.getSlides().forEach(function (slide) {
+          var background = Reveal.getSlideBackground(slide);
+          var poster = slide.getAttribute(backwards ? 'data-poster-last' : 'data-poster');
+          if (!background || !poster) return;
+          var content = background.querySelector('.slide-background-content');
+          if (content) {
+            content.style.backgroundImage = 'url(' + poster + ')';
+            content.style.backgroundSize = 'contain';
+            content.style.backgroundPosition = 'center';
+            content.style.backgroundRepeat = 'no-repeat';
+          }
+          var video = background.querySelector('video');
+          if (video) video.poster = slide.getAttribute('data-poster');
+        });
+      }
+      Reveal.on('ready', function () { applyPosters(false); });
+      Reveal.on('slidechanged', function (event) {
+        applyPosters(event.indexh < Reveal.getIndices(event.previousSlide).h);
+      });
+      if (Reveal.isReady()) applyPosters(false);
+    </script>
+"""
+
+
+def copy_poster(assets, stem, kind):
+    src = SLIDES_DIR / f"{stem}_{kind}.jpg"
+    if not src.exists():
+        return None
+    dst = Path(assets) / src.name
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(src, dst)
+    return f"{assets}{src.name}"
+
+
+def add_posters(match):
+    attrs = match.group(0)
+    first = copy_poster(match["assets"], match["stem"], "first")
+    last = copy_poster(match["assets"], match["stem"], "last")
+    if first:
+        attrs += f'\n              data-poster="{first}"'
+    if last:
+        attrs += f'\n              data-poster-last="{last}"'
+    return attrs
+
+
+def inject_posters(html):
+    html = VIDEO_ATTR.sub(add_posters, html)
+    return html.replace("  </body>", POSTER_SCRIPT + "  </body>", 1)
+
+
+if __name__ == "__main__":
+    sys.stdout.write(inject_posters(sys.stdin.read()))
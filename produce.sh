@@ -2,6 +2,16 @@
 #manim --disable_caching -qh -p bayesian.py
 set -e
 source .venv/bin/activate
+if [ "${UT_VECTOR:-0}" = 1 ]; then
+    # Vector deck drawn on a canvas: no mp4 render nor manim-slides convert, vector.py writes
+    # the page itself and the published assets shrink to vector.json and player.js
+    manim -qh ut.py
+    rm -f UnitTesting_assets/*.mp4 UnitTesting_assets/*.jpg
+    python vector.py | ./node_modules/html-inject-meta/cli.js > index.html
+    exit
+fi
 manim -qh -p ut.py
+# Raw key frames for seeking locally, then: python framestore.py --present
+#python framestore.py
 manim-slides convert --to html -c progress=true -c controls=true -cslide_number=true "UnitTesting" "UnitTesting.html"
-./node_modules/html-inject-meta/cli.js < UnitTesting.html  > index.html
+python posters.py < UnitTesting.html | ./node_modules/html-inject-meta/cli.js > index.html
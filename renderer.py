@@ -0,0 +1,626 @@
+import copy
+import gc
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import resource
+import shutil
+import subprocess
+import sys
+from functools import cache
+from pathlib import Path
+
+import manim
+import numpy as np
+from manim import (Animation, AnimationGroup, CairoRenderer, FadeIn, FadeOut, Mobject, Scene,
+                   SceneFileWriter, Transform, VMobject, config, list_update, logger, write_to_movie)
+from manim_slides import Slide
+from manim_slides.utils import merge_basenames
+from PIL import Image
+
+from vector import VectorRecorder
+
+# Content-addressed partial movies, safe to sync between machines and CI. Absolute, ffmpeg's
+# concat demuxer resolves relative entries against the folder of manim-slides' temporary list
+RENDER_CACHE = Path(os.environ.get("UT_RENDER_CACHE", "media/render_cache")).absolute()
+# Drop the renderer's per-play state (last animations, static background, held frame) at every
+# slide boundary and log resident memory; what a section keeps in locals lives until it returns
+STREAMING = os.environ.get("UT_STREAMING", "0") == "1"
+# Record display lists for the canvas player (vector.py, player.js) instead of encoding movies
+VECTOR = os.environ.get("UT_VECTOR", "0") == "1"
+# Cheap animation types are rasterized at frame_rate/stride, each frame is piped stride times
+FRAME_STRIDES = {FadeIn: 2, FadeOut: 2}
+# What Scene.compile_animation_data/begin_animations set up for one play
+PLAY_STATE = ("mobjects", "foreground_mobjects", "animations", "last_t", "stop_condition",
+              "moving_mobjects", "static_mobjects", "duration")
+POSTER_SIZE = (960, 540)
+POSTER_QUALITY = 70
+# Scene state pickled before every section into UT_CHECKPOINTS=<folder>, nothing when unset;
+# UT_RESUME=<section>, <slide number> or latest skips ahead from the checkpoints in that folder
+CHECKPOINTS = Path(os.environ["UT_CHECKPOINTS"]) if os.environ.get("UT_CHECKPOINTS") else None
+RESUME = os.environ.get("UT_RESUME")
+CHECKPOINT_STATE = {
+    "scene": ("mobjects", "foreground_mobjects", "_slides", "_base_slide_config",
+              "_current_slide", "_current_animation", "_start_animation", "_canvas", "_wait_time_between_slides"),
+    "renderer": ("num_plays", "time", "animations_hashes"),
+    "file_writer": ("partial_movie_files", "sections"),
+}
+
+
+def frame_stride(animations):
+    strides = [
+        frame_stride(a.animations) if isinstance(a, AnimationGroup)
+        else next((s for t, s in FRAME_STRIDES.items() if isinstance(a, t)), 1)
+        for a in animations
+    ]
+    return min(strides, default=1)
+
+
+def mobject_digest(mobjects):
+    digest = hashlib.blake2b(digest_size=16)
+    for mob in mobjects:
+        for m in mob.get_family():
+            digest.update(type(m).__name__.encode())
+            for attr in ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "pixel_array"):
+                value = getattr(m, attr, None)
+                if value is not None:
+                    digest.update(np.ascontiguousarray(value).tobytes())
+            digest.update(repr([getattr(m, attr, None) for attr in
+                ("stroke_width", "background_stroke_width", "sheen_factor", "z_index")]).encode())
+    return digest.hexdigest()
+
+
+def value_digest(value):
+    if isinstance(value, Mobject):
+        return mobject_digest([value])
+    if isinstance(value, Animation):
+        return animation_digest([value])
+    if isinstance(value, np.ndarray):
+        # Object arrays (AnimationGroup.anims_with_timings) hold pointers, not values
+        return value_digest(value.tolist()) if value.dtype.hasobject else value.tobytes().hex()
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(value_digest(v) for v in value) + "]"
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{k!r}:{value_digest(v)}" for k, v in value.items()) + "}"
+    if callable(value):
+        return getattr(value, "__qualname__", type(value).__name__)
+    # Anything else by its repr (colors, enums, ...); one holding an address never hits the cache
+    return repr(value)
+
+
+def animation_digest(animations):
+    digest = hashlib.blake2b(digest_size=16)
+    for anim in animations:
+        digest.update(type(anim).__name__.encode())
+        for name, value in sorted(vars(anim).items()):
+            digest.update(f"{name}={value_digest(value)};".encode())
+    return digest.hexdigest()
+
+
+@cache
+def font_digest(font):
+    try:
+        path = subprocess.run(["fc-match", "-f", "%{file}", font], capture_output=True, text=True, check=True).stdout
+        data = Path(path).read_bytes()
+    except (OSError, subprocess.CalledProcessError):
+        data = font.encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+def config_digest(scene):
+    settings = [config[k] for k in ("pixel_width", "pixel_height", "frame_rate", "frame_width", "frame_height", "movie_file_extension", "transparent")]
+    settings += [scene.camera.background_color.to_hex(), manim.__version__, *map(font_digest, scene.fonts)]
+    return repr(settings)
+
+
+def random_digest(random_state):
+    if random_state is None:
+        return ""
+    _, keys, pos, has_gauss, cached_gaussian = random_state.get_state()
+    return keys.tobytes().hex() + repr((pos, has_gauss, cached_gaussian))
+
+
+def render_key(scene, stride):
+    key = hashlib.sha256()
+    key.update(config_digest(scene).encode())
+    key.update((random_digest(scene.random_state) + repr(stride)).encode())
+    key.update(animation_digest(scene.animations).encode())
+    key.update(mobject_digest(scene.mobjects + scene.foreground_mobjects).encode())
+    return key.hexdigest()
+
+
+@cache
+def inputs_digest(deck):
+    root = Path(inspect.getsourcefile(deck)).parent
+    digest = hashlib.sha256()
+    for name in deck.checkpoint_inputs:
+        path = root / name
+        for file in sorted(path.rglob("*")) if path.is_dir() else [path]:
+            if file.is_file():
+                digest.update(f"{file.relative_to(root)}:{file_digest(file)};".encode())
+    digest.update(json.dumps(deck.checkpoint_data(), sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def checkpoint_digest(scene, pending):
+    # Deck source minus the sections still to run, editing those keeps the checkpoint valid
+    source = Path(inspect.getsourcefile(type(scene))).read_text()
+    for section in pending:
+        source = source.replace(inspect.getsource(section), "")
+    return hashlib.sha256((config_digest(scene) + inputs_digest(type(scene)) + source).encode()).hexdigest()
+
+
+def resident_mib():
+    # Resident set size from /proc, tracemalloc would slow down every allocation of the frame loop
+    try:
+        return int(Path("/proc/self/statm").read_text().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return float("nan")
+
+
+def file_digest(path):
+    # hashlib.file_digest is 3.11+, manim 0.18 still runs on 3.9
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def verify_cache_entry(path):
+    sidecar = path.with_suffix(".sha256")
+    if path.exists() and sidecar.exists() and sidecar.read_text().strip() == file_digest(path):
+        return True
+    # Another run sharing the cache may be between its two renames, a miss re-renders over it
+    if path.exists() or sidecar.exists():
+        logger.warning(f"Not reusing render cache entry {path.name}, its checksum does not match")
+    return False
+
+
+def same_colors(m1, m2):
+    attrs = ("fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "stroke_width", "background_stroke_width", "sheen_direction", "sheen_factor")
+    return all(np.array_equal(getattr(m1, attr), getattr(m2, attr)) for attr in attrs)
+
+
+class FlatTransform(Transform):
+    # Transform interpolating all points of the family as one flat array
+
+    def begin(self):
+        self.target_mobject = self.create_target()
+        self.target_copy = self.target_mobject.copy()
+        # Aligned in place as Transform.begin does, references to the submobjects stay valid
+        self.mobject.align_data(self.target_copy)
+        # Animation.begin interpolates at 0 before the flat arrays exist
+        self.flat = False
+        Animation.begin(self)
+        family = list(self.get_all_families_zipped())
+        if not all(isinstance(m, VMobject) for members in family for m in members):
+            return
+        moving = [(m, s, t) for m, s, t in family if len(s.points) or len(t.points)]
+        if any(len(s.points) != len(t.points) for _, s, t in moving):
+            return
+        self.family = [m for m, _, _ in moving]
+        self.bounds = np.cumsum([0] + [len(s.points) for _, s, _ in moving])
+        self.start_points = np.concatenate([s.points for _, s, _ in moving]) if moving else np.zeros((0, 3))
+        self.end_points = np.concatenate([t.points for _, _, t in moving]) if moving else np.zeros((0, 3))
+        self.recolored = [(m, s, t) for m, s, t in family if not same_colors(s, t)]
+        self.flat = True
+
+    def interpolate_mobject(self, alpha):
+        if not self.flat or self.lag_ratio:
+            return super().interpolate_mobject(alpha)
+        alpha = self.get_sub_alpha(alpha, 0, 1)
+        points = self.path_func(self.start_points, self.end_points, alpha)
+        for mob, a, b in zip(self.family, self.bounds[:-1], self.bounds[1:]):
+            mob.points = points[a:b]
+        for mob, start, target in self.recolored:
+            mob.interpolate_color(start, target, alpha)
+
+
+def save_slide_posters(folder, files):
+    if not files:
+        return
+    folder.mkdir(parents=True, exist_ok=True)
+    stem = merge_basenames(files).stem
+    for src, kind in ((files[0], "first"), (files[-1], "last")):
+        poster = src.with_name(f"{src.stem}_{kind}.jpg")
+        if poster.exists():
+            shutil.copyfile(poster, folder / f"{stem}_{kind}.jpg")
+
+
+class DeckFileWriter(SceneFileWriter):
+    # Plays between two next_slide() calls share one ffmpeg session, cached
+    # under the chain of their render keys; a session manifest lets later runs
+    # replay the cached session as long as the chain matches.
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache_entry = None
+        self.first_frame = None
+        self.last_frame = None
+        self.session_keys = []
+        self.session_slot = None
+        self.session_open = False
+        self.replay = None
+
+    def cache_path(self, key):
+        return RENDER_CACHE / f"{key}{config.movie_file_extension}"
+
+    def manifest_path(self, key):
+        return RENDER_CACHE / f"{key}.session.json"
+
+    def load_manifest(self, key):
+        path = self.manifest_path(key)
+        if not path.exists():
+            return None
+        try:
+            manifest = json.loads(path.read_text())
+            entry = RENDER_CACHE / manifest["file"]
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring unreadable session manifest {path.name}")
+            return None
+        return manifest if verify_cache_entry(entry) else None
+
+    def join_session(self, key):
+        if not write_to_movie():
+            return False
+        if not self.session_keys:
+            self.session_slot = (len(self.partial_movie_files), len(self.sections[-1].partial_movie_files))
+            self.partial_movie_files.append(None)
+            self.sections[-1].partial_movie_files.append(None)
+            self.replay = self.load_manifest(key)
+        self.session_keys.append(key)
+        if self.replay is None:
+            return False
+        return self.replay["keys"][:len(self.session_keys)] == self.session_keys
+
+    def open_session(self):
+        RENDER_CACHE.mkdir(parents=True, exist_ok=True)
+        path = self.cache_path(self.session_keys[0])
+        self.session_open = True
+        self.open_movie_pipe(str(path.with_name(f"{path.stem}.{os.getpid()}.tmp{path.suffix}")))
+
+    def drop_replay(self):
+        # The renderer rasterizes the replayed plays again, their frames come back through write_frame
+        self.replay = None
+
+    def close_session(self):
+        if not self.session_keys:
+            return
+        if self.replay is not None:
+            path = RENDER_CACHE / self.replay["file"]
+        elif not self.session_open:
+            path = None
+        else:
+            chain = hashlib.sha256("\n".join(self.session_keys).encode()).hexdigest()
+            self.cache_entry = path = self.cache_path(chain)
+            self.close_movie_pipe()
+            manifest = self.manifest_path(self.session_keys[0])
+            tmp = manifest.with_name(f"{manifest.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"keys": self.session_keys, "file": path.name}))
+            os.replace(tmp, manifest)
+        index, section_index = self.session_slot
+        self.partial_movie_files[index] = path and str(path)
+        self.sections[-1].partial_movie_files[section_index] = path and str(path)
+        self.session_keys, self.replay = [], None
+        self.session_open = False
+
+    def begin_animation(self, allow_write=False, file_path=None):
+        if not self.session_keys:
+            return super().begin_animation(allow_write, file_path)
+        if write_to_movie() and allow_write and not self.session_open:
+            self.open_session()
+
+    def end_animation(self, allow_write=False):
+        # The session's pipe stays open until close_session
+        if not self.session_keys:
+            return super().end_animation(allow_write)
+
+    def close_movie_pipe(self):
+        super().close_movie_pipe()
+        if self.cache_entry is not None:
+            digest = file_digest(self.partial_movie_file_path)
+            sidecar = self.cache_entry.with_suffix(".sha256")
+            tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+            tmp.write_text(digest + "\n")
+            os.replace(self.partial_movie_file_path, self.cache_entry)
+            os.replace(tmp, sidecar)
+            self.partial_movie_file_path = str(self.cache_entry)
+            self.cache_entry = None
+        if self.first_frame is not None:
+            self.save_posters(self.first_frame, self.last_frame)
+        self.first_frame, self.last_frame = None, None
+
+    def write_frame(self, frame_or_renderer):
+        if self.first_frame is None:
+            self.first_frame = frame_or_renderer
+        self.last_frame = frame_or_renderer
+        super().write_frame(frame_or_renderer)
+
+    def save_posters(self, first, last):
+        stem = Path(self.partial_movie_file_path).with_suffix("")
+        for frame, kind in ((first, "first"), (last, "last")):
+            image = Image.fromarray(frame).convert("RGB")
+            image.thumbnail(POSTER_SIZE)
+            image.save(f"{stem}_{kind}.jpg", quality=POSTER_QUALITY, optimize=True)
+
+
+class DeckRenderer(CairoRenderer):
+
+    def __init__(self, **kwargs):
+        super().__init__(file_writer_class=DeckFileWriter, **kwargs)
+        self.frame_stride = 1
+        self.held_frame = None
+        self.held_digest = None
+        self.recorder = VectorRecorder(self.camera) if VECTOR else None
+        # Pre-play copies of the plays replayed from a cached session, for when the chain diverges
+        self.snapshots = []
+
+    def play(self, scene, *args, **kwargs):
+        # Mirrors CairoRenderer.play, keyed on render_key instead of manim's hash
+        self.skip_animations = self._original_skipping_status
+        self.update_skipping_status()
+        scene.compile_animation_data(*args, **kwargs)
+        self.frame_stride = frame_stride(scene.animations)
+
+        if self.skip_animations:
+            self.time += scene.duration
+            self.file_writer.add_partial_movie_file(None)
+            self.animations_hashes.append(None)
+        elif self.recorder is not None:
+            self.file_writer.add_partial_movie_file(None)
+            self.animations_hashes.append(None)
+        elif config.disable_caching:
+            self.file_writer.add_partial_movie_file(f"uncached_{self.num_plays:05}")
+            self.animations_hashes.append(f"uncached_{self.num_plays:05}")
+        else:
+            key = render_key(scene, self.frame_stride)
+            if self.file_writer.join_session(key):
+                logger.info(f"Animation {self.num_plays} : Using cached data (key : {key})")
+                self.snapshots.append(copy.deepcopy((scene.mobjects, scene.foreground_mobjects, scene.animations)))
+                self.skip_animations = True
+                self.time += scene.duration
+            elif self.file_writer.replay is not None:
+                self.rerender(scene)
+            self.animations_hashes.append(key)
+
+        self.render_play(scene)
+        self.num_plays += 1
+
+    def render_play(self, scene):
+        self.frame_stride = frame_stride(scene.animations)
+        self.held_frame, self.held_digest = None, None
+        self.file_writer.begin_animation(not self.skip_animations and self.recorder is None)
+        scene.begin_animations()
+        self.save_static_frame_data(scene, scene.static_mobjects)
+        if scene.is_current_animation_frozen_frame():
+            self.update_frame(scene, mobjects=scene.moving_mobjects)
+            self.freeze_current_frame(scene.duration)
+        else:
+            scene.play_internal()
+        self.file_writer.end_animation(not self.skip_animations and self.recorder is None)
+        self.frame_stride = 1
+
+    def rerender(self, scene):
+        # The run diverged from the cached session: rasterize the replayed plays again
+        # from their snapshots, so cache entries only ever hold a single fresh encode
+        self.file_writer.drop_replay()
+        live = {name: getattr(scene, name) for name in PLAY_STATE}
+        time, skip = self.time, self.skip_animations
+        self.skip_animations = False
+        for mobjects, foreground_mobjects, animations in self.snapshots:
+            scene.mobjects, scene.foreground_mobjects = mobjects, foreground_mobjects
+            scene.compile_animation_data(*animations)
+            self.render_play(scene)
+        self.snapshots = []
+        for name, value in live.items():
+            setattr(scene, name, value)
+        self.time, self.skip_animations = time, skip
+        self.frame_stride = frame_stride(scene.animations)
+
+    def close_session(self, scene):
+        writer = self.file_writer
+        if writer.replay is not None and writer.replay["keys"] != writer.session_keys:
+            self.rerender(scene)
+        self.snapshots = []
+        writer.close_session()
+
+    def render(self, scene, time, moving_mobjects):
+        # Identical mobject state means an identical frame, skip the rasterization
+        digest = mobject_digest(moving_mobjects)
+        if digest != self.held_digest:
+            self.update_frame(scene, moving_mobjects)
+            self.held_frame = self.get_frame() if self.recorder is None else None
+            self.held_digest = digest
+        self.add_frame(self.held_frame)
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        if self.recorder is None:
+            return super().save_static_frame_data(scene, static_mobjects)
+        # Captures always cover the whole scene, there is no background to precompute
+        self.static_image = None
+
+    def freeze_current_frame(self, duration):
+        if self.recorder is None:
+            return super().freeze_current_frame(duration)
+        self.add_frame(None, num_frames=int(duration * self.camera.frame_rate))
+
+    def update_frame(self, scene, *args, **kwargs):
+        if self.recorder is None:
+            return super().update_frame(scene, *args, **kwargs)
+        # Always the whole scene, static mobjects are not baked into a background
+        self.recorder.capture(list_update(scene.mobjects, scene.foreground_mobjects))
+
+    def add_frame(self, frame, num_frames=1):
+        if self.skip_animations:
+            return
+        self.time += num_frames * self.frame_stride / self.camera.frame_rate
+        if self.recorder is not None:
+            self.recorder.add(num_frames * self.frame_stride)
+            return
+        for _ in range(num_frames * self.frame_stride):
+            self.file_writer.write_frame(frame)
+
+    def scene_finished(self, scene):
+        self.close_session(scene)
+        if self.recorder is None:
+            super().scene_finished(scene)
+
+
+class DeckSlide(Slide):
+    # Slide rendered through DeckRenderer: sections() returns the bound methods
+    # building the deck in order, construct() checkpoints the scene between them.
+
+    # Fonts the slides render text with, their files are part of every render key
+    fonts = ()
+    # Generator the slides draw from, its state is part of every render key and checkpoint
+    random_state = None
+    # Files next to the deck script the sections read, part of every checkpoint key
+    checkpoint_inputs = ()
+    # Attributes the sections keep on the scene across section boundaries
+    checkpoint_attributes = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, renderer=DeckRenderer(), **kwargs)
+
+    def get_time_progression(self, run_time, *args, **kwargs):
+        frame_rate = config.frame_rate
+        config.frame_rate = frame_rate / self.renderer.frame_stride
+        try:
+            return super().get_time_progression(run_time, *args, **kwargs)
+        finally:
+            config.frame_rate = frame_rate
+
+    def play(self, *args, **kwargs):
+        super().play(*args, **kwargs)
+        if len(self.renderer.file_writer.session_keys) > 1:
+            # Coalesced into the slide's encoder session, one movie file for manim-slides
+            self._current_animation -= 1
+
+    def render(self, *args, **kwargs):
+        if self.renderer.recorder is None:
+            return super().render(*args, **kwargs)
+        # No movies to concatenate, the recording replaces slides/<scene>.json
+        Scene.render(self, *args, **kwargs)
+        self.renderer.recorder.mark_slide(self._base_slide_config)
+        self.renderer.recorder.save(self._output_folder / f"{self}.vector.json")
+
+    def next_slide(self, *args, **kwargs):
+        self.renderer.close_session(self)
+        if self.renderer.recorder is not None:
+            self.renderer.recorder.mark_slide(self._base_slide_config)
+        if self._current_animation > self._start_animation:
+            files = self._partial_movie_files[self._start_animation:self._current_animation]
+            save_slide_posters(self._output_folder / "files" / str(self), files)
+        super().next_slide(*args, **kwargs)
+        if STREAMING:
+            self.release()
+
+    def sections(self):
+        return []
+
+    @classmethod
+    def checkpoint_data(cls):
+        # Anything else the sections read that no input file captures
+        return None
+
+    def construct(self):
+        sections = self.sections()
+        start = self.resume(sections)
+        for index, section in enumerate(sections[start:], start):
+            if index > start and CHECKPOINTS and not VECTOR:
+                self.save_checkpoint(sections, index)
+            section()
+
+    def checkpoint_path(self, sections, index):
+        return CHECKPOINTS / f"{checkpoint_digest(self, sections[index:])}.pkl"
+
+    def checkpoint_targets(self):
+        return {"scene": self, "renderer": self.renderer, "file_writer": self.renderer.file_writer}
+
+    def save_checkpoint(self, sections, index):
+        targets = self.checkpoint_targets()
+        attributes = dict(CHECKPOINT_STATE, scene=CHECKPOINT_STATE["scene"] + self.checkpoint_attributes)
+        state = {part: {a: getattr(targets[part], a) for a in attrs if hasattr(targets[part], a)}
+                 for part, attrs in attributes.items()}
+        state["rng"] = self.random_state and self.random_state.get_state()
+        CHECKPOINTS.mkdir(parents=True, exist_ok=True)
+        path = self.checkpoint_path(sections, index)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            tmp.unlink(missing_ok=True)
+            logger.warning(f"No checkpoint before {sections[index].__name__}: {e}")
+            return
+        tmp.replace(path)
+        info = {"deck": type(self).__name__, "section": sections[index].__name__}
+        path.with_suffix(".json").write_text(json.dumps({**info, "slide": self._current_slide}))
+        self.prune_checkpoints(path, info)
+
+    def prune_checkpoints(self, current, info):
+        # A section has one valid checkpoint at a time, the others were keyed on older sources or inputs
+        for sidecar in CHECKPOINTS.glob("*.json"):
+            if sidecar.stem == current.stem:
+                continue
+            try:
+                stale = all(json.loads(sidecar.read_text()).get(k) == v for k, v in info.items())
+            except (OSError, ValueError, AttributeError):
+                continue
+            if stale:
+                sidecar.with_suffix(".pkl").unlink(missing_ok=True)
+                sidecar.unlink(missing_ok=True)
+
+    def resume(self, sections):
+        if not RESUME:
+            return 0
+        if CHECKPOINTS is None:
+            logger.warning("UT_RESUME needs UT_CHECKPOINTS=<folder> to resume from, rendering every section")
+            return 0
+        if VECTOR:
+            logger.warning("UT_RESUME is ignored with UT_VECTOR, the recording needs every slide")
+            return 0
+        names = [s.__name__ for s in sections]
+        if RESUME not in names and RESUME != "latest" and not RESUME.isdigit():
+            raise ValueError(f"UT_RESUME={RESUME} is neither a section ({', '.join(names)}), a slide number nor 'latest'")
+        for index in range(len(sections) - 1, 0, -1):
+            path = self.checkpoint_path(sections, index)
+            if not path.exists() or not path.with_suffix(".json").exists():
+                continue
+            slide = json.loads(path.with_suffix(".json").read_text())["slide"]
+            if (RESUME in names and index > names.index(RESUME)) or (RESUME.isdigit() and slide > int(RESUME)):
+                continue
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+            # The movies of skipped slides are reused, they must still be in the cache
+            files = state["file_writer"]["partial_movie_files"]
+            if not all(Path(file).exists() for file in files if file is not None):
+                continue
+            for part, target in self.checkpoint_targets().items():
+                for name, value in state[part].items():
+                    setattr(target, name, value)
+            if self.random_state is not None:
+                self.random_state.set_state(state["rng"])
+            logger.info(f"Resuming at slide {slide} ({names[index]})")
+            return index
+        logger.warning(f"No checkpoint to resume from for UT_RESUME={RESUME}, rendering every section")
+        return 0
+
+    def release(self):
+        # Per-play state only, the on-screen mobjects and the running section's locals stay alive
+        before = resident_mib()
+        self.animations = None
+        self.moving_mobjects, self.static_mobjects = [], []
+        self.renderer.static_image = None
+        self.renderer.held_frame, self.renderer.held_digest = None, None
+        gc.collect()
+        current = resident_mib()
+        # ru_maxrss is in KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10)
+        logger.info(
+            f"Slide {self._current_slide}: dropped play state, {current:.1f} MiB resident "
+            f"({current - before:+.1f} MiB, peak {peak:.1f} MiB)"
+        )
@@ -1,5 +1,6 @@
 from manim import *
-from manim_slides import Slide
+from churn import churn_stats
+from renderer import DeckSlide, FlatTransform
 from manim.utils import color
 from manim.utils.color import interpolate_color
 from numpy.random import RandomState
@@ -20,8 +21,9 @@ small_size = 16
 mid_size = 20
 big_size = 25
 N = 6
-Text.set_default(font="Comic Code Ligatures", color=TEXT_COLOR, font_size=small_size)
-Code.set_default(font="Comic Code Ligatures", font_size=small_size, style="manni", background="window", tab_width=4, line_spacing=0.65)
+FONT = "Comic Code Ligatures"
+Text.set_default(font=FONT, color=TEXT_COLOR, font_size=small_size)
+Code.set_default(font=FONT, font_size=small_size, style="manni", background="window", tab_width=4, line_spacing=0.65)
 Tex.set_default(color=TEXT_COLOR, font_size=small_size)
 Dot.set_default(radius=0.07, color=DOT_COLOR)
 
@@ -210,7 +212,27 @@ def keep_only_objects(slide, grp):
     for _ in grp:
         slide.add(_)
 
-class UnitTesting(Slide):
+def churn_bars(ratio, color, height=1.5):
+    bars = VGroup(*[
+        Rectangle(width=0.35, height=max(height*share/100, 0.02), color=c, fill_color=c, fill_opacity=0.6)
+        for share, c in ((ratio, color), (100-ratio, GRAPH_COLOR))
+    ]).arrange(RIGHT, buff=0.15, aligned_edge=DOWN)
+    labels = VGroup(*[
+        Text(label, font_size=very_small_size).next_to(bar, DOWN, buff=0.1)
+        for label, bar in zip(("tests/", "rest"), bars)
+    ])
+    return VGroup(bars, labels)
+
+class UnitTesting(DeckSlide):
+    fonts = (FONT,)
+    random_state = rng
+    checkpoint_inputs = ("images", "churn.py", "vector.py", "renderer.py")
+    checkpoint_attributes = ("layout", "title")
+
+    @classmethod
+    def checkpoint_data(cls):
+        # The churn figures come from the clones, not from any file in the tree
+        return churn_stats()
 
     def itemize(self, items, anchor, distance, stepwise, **kwargs):
         anims = []
@@ -234,14 +256,36 @@ class UnitTesting(Slide):
 
     def construct(self):
         self.camera.background_color = BACKGROUND_COLOR
+        super().construct()
+
+    def sections(self):
+        return [
+            self.opening,
+            self.importance,
+            self.what_to_test,
+            self.principles,
+            self.testable_basics,
+            self.difficult_classes,
+            self.foamut,
+            self.hands_on,
+            self.hands_on_advanced,
+            self.espionage_mode,
+            self.ci_integration,
+            self.rts_classes,
+            self.reflections,
+            self.success_stories,
+            self.closing,
+        ]
+
+    def opening(self):
         # Title page
-        layout = Group()
-        title = Text(f"Unit testing OpenFOAM code with foamUT", font_size=big_size)#.to_edge(UP+LEFT)
+        self.layout = Group()
+        self.title = Text(f"Unit testing OpenFOAM code with foamUT", font_size=big_size)#.to_edge(UP+LEFT)
         footer = Text("NHR4CES", t2w={"NHR4CES": BOLD}, font_size=very_small_size).to_edge(DOWN+RIGHT)
         author = Text("Mohammed Elwardi Fadeli, Sept. 2024", font_size=very_small_size).to_edge(DOWN+LEFT)
-        logo = ImageMobject("./images/nhr-tu-logo.png").next_to(title, UP).scale(0.6)#.to_edge(UP+RIGHT)
-        layout.add(title, footer, author, logo)
-        self.play(FadeIn(layout))
+        logo = ImageMobject("./images/nhr-tu-logo.png").next_to(self.title, UP).scale(0.6)#.to_edge(UP+RIGHT)
+        self.layout.add(self.title, footer, author, logo)
+        self.play(FadeIn(self.layout))
         self.next_slide()
 
         c1 = Text(f"Plan Features")
@@ -249,7 +293,7 @@ class UnitTesting(Slide):
         bg1 = BackgroundRectangle(c1, color=MAIN_COLOR, fill_opacity=0.3, buff=BOX_BUFF)
         vg1 = VGroup(c1, b1, bg1).to_edge(UP).shift(2*(LEFT+DOWN))
         anims =[
-            Transform(title, vg1),
+            FlatTransform(self.title, vg1),
             Transform(logo, logo.copy().scale(0.5).to_edge(UP+RIGHT)),
         ]
         self.play(AnimationGroup(*anims))
@@ -319,14 +363,14 @@ class UnitTesting(Slide):
         )
         self.next_slide()
 
-        layout.remove(title)
-        title = self.header("ToC", "-.-")
-        layout.add(title)
+        self.layout.remove(self.title)
+        self.title = self.header("ToC", "-.-")
+        self.layout.add(self.title)
         diagram = VGroup(vg1, vg2, vg3, vg4, vg5, vg6)
-        keep_only_objects(self, Group(layout, diagram))
-        self.play(Transform(diagram, title))
+        keep_only_objects(self, Group(self.layout, diagram))
+        self.play(FlatTransform(diagram, self.title))
 
-        objs = Text("We'll be looking at:", font_size=mid_size).next_to(title, DOWN*4).align_to(title, LEFT)
+        objs = Text("We'll be looking at:", font_size=mid_size).next_to(self.title, DOWN*4).align_to(self.title, LEFT)
         self.play(FadeIn(objs))
         items = [
             "General notes on unit-tests",
@@ -339,12 +383,13 @@ class UnitTesting(Slide):
             t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
         self.next_slide()
 
+    def importance(self):
         t00 = self.header("The Importance of Unit Testing in OpenFOAM", "0.0")
-        keep_only_objects(self, layout)
-        self.play(Transform(title, t00))
+        keep_only_objects(self, self.layout)
+        self.play(FlatTransform(self.title, t00))
         self.next_slide()
 
-        objs = Text("- Enforcing Intention-Code 'strong coupling':", font_size=mid_size).next_to(title, DOWN*2).align_to(title, LEFT)
+        objs = Text("- Enforcing Intention-Code 'strong coupling':", font_size=mid_size).next_to(self.title, DOWN*2).align_to(self.title, LEFT)
         self.play(FadeIn(objs))
         items = [
             "New functionality works as intended.",
@@ -357,7 +402,7 @@ class UnitTesting(Slide):
             t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
         self.next_slide()
 
-        objs = Text("- Automated tests?", font_size=mid_size).next_to(title, DOWN*14).align_to(title, LEFT)
+        objs = Text("- Automated tests?", font_size=mid_size).next_to(self.title, DOWN*14).align_to(self.title, LEFT)
         self.play(FadeIn(objs))
         items = [
             "Usually unexpensive, testing small code entities.",
@@ -370,12 +415,13 @@ class UnitTesting(Slide):
             t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
         self.next_slide()
 
+    def what_to_test(self):
         t2 = self.header("Identifying Which OpenFOAM Code to Test", "1.0")
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t2))
+        keep_only_objects(self, Group(self.layout))
+        self.play(FlatTransform(self.title, t2))
         self.next_slide()
 
-        objs = Text("- Effective unit-testing takes:", font_size=mid_size).next_to(title, DOWN*2).align_to(title, LEFT)
+        objs = Text("- Effective unit-testing takes:", font_size=mid_size).next_to(self.title, DOWN*2).align_to(self.title, LEFT)
         self.play(FadeIn(objs))
         items = [
             "Writing test-friendly code in the first place.",
@@ -387,7 +433,7 @@ class UnitTesting(Slide):
             t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
         self.next_slide()
 
-        objs = Text("- Test-friendly code?", font_size=mid_size).next_to(title, DOWN*12).align_to(title, LEFT)
+        objs = Text("- Test-friendly code?", font_size=mid_size).next_to(self.title, DOWN*12).align_to(self.title, LEFT)
         self.play(FadeIn(objs))
         items = [
             "Minimal interfacing with Disk IO, databases, external protocols ... etc.",
@@ -400,12 +446,13 @@ class UnitTesting(Slide):
             t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
         self.next_slide()
 
+    def principles(self):
         t3 = self.header(f"Principles behind unit-testing", "1.1")
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t3))
+        keep_only_objects(self, Group(self.layout))
+        self.play(FlatTransform(self.title, t3))
         self.next_slide()
 
-        objs = Text("- Isolation:", font_size=mid_size).next_to(title, DOWN*2).align_to(title, LEFT)
+        objs = Text("- Isolation:", font_size=mid_size).next_to(self.title, DOWN*2).align_to(self.title, LEFT)
         self.play(FadeIn(objs))
         items = [
             "Each class is tested in its default state (configuration).",
@@ -418,7 +465,7 @@ class UnitTesting(Slide):
             t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
         self.next_slide()
 
-        objs = Text("- Production parity:", font_size=mid_size).next_to(last, DOWN*3).align_to(title, LEFT)
+        objs = Text("- Production parity:", font_size=mid_size).next_to(last, DOWN*3).align_to(self.title, LEFT)
         self.play(FadeIn(objs))
         items = [
             "Stay as close as possible to 'standard usage' of classes.",
@@ -431,9 +478,10 @@ class UnitTesting(Slide):
             t2c={f"1{ITEM_ICON}": MAIN_COLOR, f"2{ITEM_ICON}": MAIN_COLOR, f"3{ITEM_ICON}": MAIN_COLOR, f"4{ITEM_ICON}": MAIN_COLOR})
         self.next_slide()
 
+    def testable_basics(self):
         t4 = self.header(f"Writing Testable OpenFOAM Code: The basics", "2.0")
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t4))
+        keep_only_objects(self, Group(self.layout))
+        self.play(FlatTransform(self.title, t4))
         self.next_slide()
 
         code_t = testable_code
@@ -464,7 +512,7 @@ class UnitTesting(Slide):
         self.play(FadeIn(VGroup(ev1, ev2)))
         self.next_slide()
 
-        keep_only_objects(self, Group(layout, code1))
+        keep_only_objects(self, Group(self.layout, code1))
         code2 = Code(code=testable_code, language="cpp").to_edge(RIGHT)
         self.play(Transform(code1, code2))
         self.next_slide()
@@ -481,18 +529,20 @@ class UnitTesting(Slide):
         self.play(FadeIn(VGroup(ev1, ev2)))
         self.next_slide()
 
+    def difficult_classes(self):
         t5 = self.header("Tackling Difficult-to-Test Classes", "2.1")
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t5))
+        keep_only_objects(self, Group(self.layout))
+        self.play(FlatTransform(self.title, t5))
         self.next_slide()
 
         code = Code(code=self_configured, language="cpp")
         self.play(FadeIn(code))
         self.next_slide()
 
+    def foamut(self):
         t6 = self.header(f"foamUT: Effective OpenFOAM unit-testing", "2.2")
-        keep_only_objects(self, Group(layout))
-        self.play(Transform(title, t6))
+        keep_only_objects(self, Group(self.layout))
+        self.play(FlatTransform(self.title, t6))
         self.next_slide()
 
         im = ImageMobject("./images/foamUT-qr.png").scale(0.3).to_corner(RIGHT+DOWN).shift(UP)
@@ -554,7 +604,7 @@ class UnitTesting(Slide):
         self.next_slide()
 
         self.play(vg1.animate.scale(1.5))
-        keep_only_objects(self, Group(layout, vg1))
+        keep_only_objects(self, Group(self.layout, vg1))
         self.play(Transform(vg1, Code(code=test_case, language="cpp").to_edge(RIGHT)))
         self.next_slide()
 
@@ -580,16 +630,17 @@ class UnitTesting(Slide):
         self.play(FadeIn(ev1))
         self.next_slide()
 
-        keep_only_objects(self, Group(layout, vg1))
+        keep_only_objects(self, Group(self.layout, vg1))
         self.play(Transform(vg1, Code(
             code=test_case_log,
             language="Makefile",
         )))
         self.next_slide()
 
-        keep_only_objects(self, Group(layout))
+    def hands_on(self):
+        keep_only_objects(self, Group(self.layout))
         t7 = self.header("Hands-On: Basic Usage of foamUT", "2.3")
-        self.play(Transform(title, t7))
+        self.play(FlatTransform(self.title, t7))
         self.next_slide()
 
         code = Code(code=handson1, language="cpp")
@@ -603,18 +654,20 @@ class UnitTesting(Slide):
         self.play(Transform(code, code_t))
         self.next_slide()
 
-        keep_only_objects(self, Group(layout))
+    def hands_on_advanced(self):
+        keep_only_objects(self, Group(self.layout))
         t8 = self.header(f"Hands-On: Advanced foamUT Techniques", "2.4")
-        self.play(Transform(title, t8))
+        self.play(FlatTransform(self.title, t8))
         self.next_slide()
 
         code = Code(code=handson4, language="cpp")
         self.play(FadeIn(code))
         self.next_slide()
 
-        keep_only_objects(self, layout)
+    def espionage_mode(self):
+        keep_only_objects(self, self.layout)
         t9 = self.header("Advanced foamUT: Espionage Mode", "2.5")
-        self.play(Transform(title, t9))
+        self.play(FlatTransform(self.title, t9))
         self.next_slide()
 
         code = Code(code=espionage, language="cpp")
@@ -625,10 +678,11 @@ class UnitTesting(Slide):
         self.play(FadeIn(tx, Line(code.get_corner(UP+RIGHT), code.get_corner(LEFT+DOWN), color=DOT_COLOR, stroke_width=3)))
         self.next_slide()
 
-        keep_only_objects(self, layout)
+    def ci_integration(self):
+        keep_only_objects(self, self.layout)
         t10 = self.header("Integrating foamUT with CI", "2.6")
         code = Code(code=timeouts, language="cpp")
-        self.play(Transform(title, t10), FadeIn(code))
+        self.play(FlatTransform(self.title, t10), FadeIn(code))
         self.next_slide()
         
         tx = Text(f"POSIX signaling works for serial tests", color=GRAPH_COLOR).next_to(code,DOWN)
@@ -636,9 +690,10 @@ class UnitTesting(Slide):
         self.play(FadeIn(tx, ty))
         self.next_slide()
 
-        keep_only_objects(self, layout)
+    def rts_classes(self):
+        keep_only_objects(self, self.layout)
         t11 = self.header(f"Testing RTS Classes: The Ideal Approach", "3.0")
-        self.play(Transform(title, t11))
+        self.play(FlatTransform(self.title, t11))
         self.next_slide()
 
         code_t = orig_code
@@ -666,7 +721,7 @@ class UnitTesting(Slide):
         self.play(FadeIn(ev1))
         self.next_slide()
 
-        keep_only_objects(self, Group(layout, code))
+        keep_only_objects(self, Group(self.layout, code))
         code_t = orig_code
         for i in [8, 9]:
             code_t = replace_nth_line(code_t, i, "   ")
@@ -691,7 +746,7 @@ class UnitTesting(Slide):
         self.play(FadeIn(VGroup(ev1, ev2)))
         self.next_slide()
 
-        keep_only_objects(self, Group(layout, code2))
+        keep_only_objects(self, Group(self.layout, code2))
         code3 = Code(code=orig_code, language="cpp").to_edge(RIGHT)
 
         ev1 = Text(r"Oops, need to create a", t2c={"Oops,": WARN_COLOR}, line_spacing=0.4, font_size=small_size)
@@ -712,7 +767,7 @@ class UnitTesting(Slide):
         self.play(FadeIn(VGroup(ev1, ev2)))
         self.next_slide()
 
-        keep_only_objects(self, Group(layout, code3))
+        keep_only_objects(self, Group(self.layout, code3))
 
         ev1 = Text(r"Still including only", line_spacing=0.4, font_size=small_size)
         ev1.next_to(code3, LEFT).shift(UP * 2)
@@ -733,9 +788,9 @@ class UnitTesting(Slide):
         self.play(FadeIn(VGroup(ev1, ev2, ev3, ev4)))
         self.next_slide()
 
-        keep_only_objects(self, layout)
+        keep_only_objects(self, self.layout)
 
-        objs = Text("- Objectives again?", font_size=mid_size).next_to(title, DOWN*2).align_to(title, LEFT)
+        objs = Text("- Objectives again?", font_size=mid_size).next_to(self.title, DOWN*2).align_to(self.title, LEFT)
         self.play(FadeIn(objs))
 
         items = [
@@ -749,7 +804,7 @@ class UnitTesting(Slide):
             t2c={f"1{ITEM_ICON}": GREEN, f"2{ITEM_ICON}": GREEN, f"3{ITEM_ICON}": GREEN, f"4{ITEM_ICON}": GREEN})
         self.next_slide()
 
-        objs = Text("- How much can we realistically achieve?", font_size=mid_size).next_to(title, DOWN*14).align_to(title, LEFT)
+        objs = Text("- How much can we realistically achieve?", font_size=mid_size).next_to(self.title, DOWN*14).align_to(self.title, LEFT)
         self.play(FadeIn(objs))
 
         items = [
@@ -762,7 +817,7 @@ class UnitTesting(Slide):
             t2c={f"1{ITEM_ICON}": GREEN, f"2{ITEM_ICON}": GREEN, f"3{ITEM_ICON}": GREEN, f"4{ITEM_ICON}": GREEN})
         self.next_slide()
 
-        keep_only_objects(self, layout)
+        keep_only_objects(self, self.layout)
 
         cols = {
             "class": YELLOW,
@@ -794,11 +849,12 @@ class UnitTesting(Slide):
         )
         self.next_slide()
 
-        keep_only_objects(self, layout)
+    def reflections(self):
+        keep_only_objects(self, self.layout)
         t12 = self.header("C++ Reflections for unit-testing", "3.1")
-        self.play(Transform(title, t12))
+        self.play(FlatTransform(self.title, t12))
 
-        objs = Text("- A little bit of setup can get us:", font_size=mid_size).next_to(title, DOWN*2).align_to(title, LEFT)
+        objs = Text("- A little bit of setup can get us:", font_size=mid_size).next_to(self.title, DOWN*2).align_to(self.title, LEFT)
         self.play(FadeIn(objs))
 
         items = [
@@ -812,7 +868,7 @@ class UnitTesting(Slide):
 
         self.next_slide()
 
-        objs = Text("- Fetching default values accurately is important because:", font_size=mid_size).next_to(title, DOWN*13).align_to(title, LEFT)
+        objs = Text("- Fetching default values accurately is important because:", font_size=mid_size).next_to(self.title, DOWN*13).align_to(self.title, LEFT)
         self.play(FadeIn(objs))
 
         items = [
@@ -826,16 +882,19 @@ class UnitTesting(Slide):
             t2c={f"1{ITEM_ICON}": GREEN, f"2{ITEM_ICON}": GREEN, f"3{ITEM_ICON}": GREEN, f"4{ITEM_ICON}": GREEN})
         self.next_slide()
 
+    def success_stories(self):
         t13 = self.header(f"Real-World Success Stories", "4.0")
-        keep_only_objects(self, layout)
-        self.play(Transform(title, t13))
+        keep_only_objects(self, self.layout)
+        self.play(FlatTransform(self.title, t13))
         self.next_slide()
 
+        churn = churn_stats()
         bamr = ImageMobject("./images/bamr.png").shift(3*LEFT).scale(0.3).shift(UP)
+        cbamr = churn_bars(churn["blastAMR"], GREEN).next_to(bamr, LEFT)
         tbamr1 = Text(f"STFS-TUDa/blastAMR", color=GREEN).next_to(bamr, DOWN)
-        tbamr2 = Text(f"25% git adds/dels for tests/").next_to(tbamr1, DOWN)
+        tbamr2 = Text(f"{churn['blastAMR']:.3g}% git adds/dels for tests/").next_to(tbamr1, DOWN)
         tbamr3 = Text(f"Includes custom cases, with history").next_to(tbamr2, DOWN)
-        self.play(FadeIn(bamr, tbamr1, tbamr2, tbamr3))
+        self.play(FadeIn(bamr, cbamr, tbamr1, tbamr2, tbamr3))
         self.next_slide()
 
         ref = ImageMobject("./images/reflections.png").shift(3*RIGHT).scale(0.3).shift(UP)
@@ -845,12 +904,13 @@ class UnitTesting(Slide):
         self.play(FadeIn(ref, tr1, tr2, tr3))
         self.next_slide()
 
-        keep_only_objects(self, layout)
+        keep_only_objects(self, self.layout)
         smartsim = ImageMobject("./images/smartsim.png").shift(3*LEFT).scale(0.3).shift(UP)
+        csmartsim = churn_bars(churn["openfoam-smartsim"], GREEN).next_to(smartsim, LEFT)
         ts1 = Text(f"OFDataCommittee/openfoam-smartsim", color=GREEN).next_to(smartsim, DOWN)
-        ts2 = Text(f"0.2% git adds/dels for tests/").next_to(ts1, DOWN)
+        ts2 = Text(f"{churn['openfoam-smartsim']:.3g}% git adds/dels for tests/").next_to(ts1, DOWN)
         ts3 = Text(f"Super-efficient testing").next_to(ts2, DOWN)
-        self.play(FadeIn(smartsim, ts1, ts2, ts3))
+        self.play(FadeIn(smartsim, csmartsim, ts1, ts2, ts3))
         self.next_slide()
 
         def discussion(logo, color, user, msg):
@@ -895,7 +955,9 @@ class UnitTesting(Slide):
         self.play(FadeIn(gr2, gr3, gr4))
         self.next_slide()
 
+    def closing(self):
         tf = Text(f"THANK YOU", t2w={"THANK YOU": BOLD}, font_size=big_size*2)
-        keep_only_objects(self, layout)
-        self.play(Transform(title, tf))
+        keep_only_objects(self, self.layout)
+        self.play(FlatTransform(self.title, tf))
         self.next_slide()
+
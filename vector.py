@@ -0,0 +1,253 @@
+import base64
+import hashlib
+import html as markup
+import io
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+VECTOR_FILE = Path("slides/UnitTesting.vector.json")
+ASSETS_DIR = Path("UnitTesting_assets")
+PLAYER = Path(__file__).with_name("player.js")
+# Frame units, 1e-3 is a quarter of a pixel at 4K
+PRECISION = 3
+STEP = 10 ** -PRECISION
+REVEAL = "https://cdnjs.cloudflare.com/ajax/libs/reveal.js/5.1.0"
+# Same reveal.js setup as manim-slides' html export, without any video background
+PAGE = """<!doctype html>
+<html>
+  <head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
+
+    <title>{title}</title>
+
+    <link rel="stylesheet" href="{reveal}/reveal.min.css">
+    <link rel="stylesheet" href="{reveal}/theme/black.min.css">
+  </head>
+
+  <body>
+    <div class="reveal">
+      <div class="slides">{sections}</div>
+    </div>
+
+    <script src="{reveal}/reveal.min.js"></script>
+    <script>
+      Reveal.initialize({{
+        width: '100%',
+        height: '100%',
+        margin: 0.04,
+        minScale: 0.2,
+        maxScale: 2.0,
+        progress: true,
+        controls: true,
+        slideNumber: true,
+        hideInactiveCursor: true,
+        hideCursorTime: 5000
+      }});
+    </script>
+    <script src="{assets}/player.js" data-deck="{assets}/vector.json"></script>
+  </body>
+</html>
+"""
+
+
+def first_rgba(rgbas):
+    # Only the first stop of a gradient is kept
+    return np.clip(rgbas[0], 0, 1) if len(rgbas) else np.zeros(4)
+
+
+def hex_color(rgba, opacity):
+    # Alpha relative to the item's opacity, omitted when opaque
+    if rgba[3] <= 0:
+        return None
+    alpha = round(255 * rgba[3] / opacity)
+    return "#" + "".join(f"{round(255 * c):02x}" for c in rgba[:3]) + (f"{alpha:02x}" if alpha < 255 else "")
+
+
+def png_data_url(pixels):
+    buffer = io.BytesIO()
+    Image.fromarray(pixels, "RGBA").save(buffer, "PNG", optimize=True)
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+class VectorRecorder:
+    # Display lists instead of pixels: paths are stored once relative to their
+    # first point (repeated glyphs share one entry) and paints (path, colors at
+    # full opacity, widths) once. Frames are (paint, x, y, opacity) entries,
+    # diffed against the previous frame, so fades and moves only cost a run per
+    # group of entries that change together, never new paints.
+
+    def __init__(self, camera):
+        self.camera = camera
+        self.paths, self.paints = {}, {}
+        self.images, self.image_alpha, self.image_ids, self.image_digests = [], [], {}, {}
+        self.shapes, self.image_paints = {}, set()
+        self.frames, self.slides = [], []
+        self.current, self.previous, self.decoded, self.start = (), (), (), 0
+
+    def shape(self, vmobject, points):
+        raw = points.tobytes()
+        if raw not in self.shapes:
+            origin = points[0, :2]
+            commands = []
+            for subpath in vmobject.gen_subpaths_from_points_2d(points):
+                rel = np.round(subpath[:, :2] - origin, PRECISION) + 0.0
+                commands.append("M%g %g" % tuple(rel[0]))
+                for quad in vmobject.gen_cubic_bezier_tuples_from_points(rel):
+                    commands.append("C%g %g %g %g %g %g" % tuple(np.ravel(quad[1:])))
+                if vmobject.consider_points_equals_2d(subpath[0], subpath[-1]):
+                    commands.append("Z")
+            path = self.paths.setdefault("".join(commands), len(self.paths))
+            self.shapes[raw] = (path, *origin.tolist())
+        return self.shapes[raw]
+
+    def stroke(self, vmobject, background):
+        width = round(vmobject.get_stroke_width(background) * self.camera.cairo_line_width_multiple, 4)
+        return first_rgba(self.camera.get_stroke_rgbas(vmobject, background=background)), width
+
+    def vector_entry(self, vmobject):
+        points = self.camera.transform_points_pre_display(vmobject, vmobject.points)
+        if len(points) == 0:
+            return None
+        fill = first_rgba(self.camera.get_fill_rgbas(vmobject))
+        strokes = [self.stroke(vmobject, background) for background in (False, True)]
+        opacity = max(fill[3], *(rgba[3] for rgba, width in strokes if width))
+        if opacity <= 0:
+            return None
+        path, x, y = self.shape(vmobject, points)
+        (stroke, width), (background, background_width) = [
+            (hex_color(rgba, opacity), width) if width else (None, 0) for rgba, width in strokes
+        ]
+        paint = (path, hex_color(fill, opacity), stroke, width, background, background_width)
+        return (self.paints.setdefault(paint, len(self.paints)), x, y, round(float(opacity), 3))
+
+    def image_entry(self, mobject):
+        pixels = mobject.get_pixel_array()
+        alpha = int(pixels[..., 3].sum())
+        if alpha == 0:
+            return None
+        # Fades rewrite the alpha channel of the same mobject, key on it rather than on its pixels
+        if id(mobject) not in self.image_ids:
+            digest = hashlib.blake2b(pixels[..., :3].tobytes()).hexdigest()
+            if digest not in self.image_digests:
+                self.image_digests[digest] = len(self.images)
+                self.images.append(pixels.copy())
+                self.image_alpha.append(alpha)
+            self.image_ids[id(mobject)] = (mobject, self.image_digests[digest])
+        image = self.image_ids[id(mobject)][1]
+        if alpha > self.image_alpha[image]:
+            self.images[image], self.image_alpha[image] = pixels.copy(), alpha
+        ul, ur, dl = self.camera.transform_points_pre_display(mobject, mobject.points)[:3, :2]
+        paint = (None, image, *np.round(np.concatenate([ur - ul, dl - ul]), PRECISION).tolist())
+        paint = self.paints.setdefault(paint, len(self.paints))
+        self.image_paints.add(paint)
+        # The alpha sum becomes an opacity in save(), once the image's most opaque state is known
+        return (paint, *ul.tolist(), alpha)
+
+    def capture(self, mobjects):
+        # manim is only needed while recording, write_page() runs without it
+        from manim import VMobject
+        from manim.mobject.types.image_mobject import AbstractImageMobject
+
+        entries = []
+        for mobject in self.camera.get_mobjects_to_display(mobjects):
+            if isinstance(mobject, VMobject):
+                entry = self.vector_entry(mobject)
+            elif isinstance(mobject, AbstractImageMobject):
+                entry = self.image_entry(mobject)
+            else:
+                entry = None
+            if entry is not None:
+                entries.append(entry)
+        self.current = tuple(entries)
+
+    def diff(self, previous, current):
+        # Entries keeping the paint they had at the same index of the previous frame collapse
+        # into runs [-length, dx, dy, opacity or None to keep it]. Shifts are taken against what
+        # the player decoded, so joining a run within one rounding step never accumulates.
+        # Images only join runs while their opacity holds, save() rescales their alpha sums.
+        values, decoded = [], []
+        for i, entry in enumerate(current):
+            old = previous[i] if i < len(previous) else None
+            if old is None or old[0] != entry[0] or (entry[0] in self.image_paints and old[3] != entry[3]):
+                entry = (entry[0], round(entry[1], PRECISION) + 0.0, round(entry[2], PRECISION) + 0.0, entry[3])
+                values += entry
+                decoded.append(entry)
+                continue
+            dx, dy, opacity = entry[1] - old[1], entry[2] - old[2], None if entry[3] == old[3] else entry[3]
+            if (values and values[-4] < 0 and values[-1] == opacity
+                    and abs(values[-3] - dx) <= STEP and abs(values[-2] - dy) <= STEP):
+                values[-4] -= 1
+            else:
+                values += [-1, round(dx, PRECISION) + 0.0, round(dy, PRECISION) + 0.0, opacity]
+            decoded.append((entry[0], old[1] + values[-3], old[2] + values[-2], entry[3]))
+        return values, decoded
+
+    def add(self, count):
+        if len(self.frames) > self.start and self.current == self.previous:
+            self.frames[-1][0] += count
+            return
+        # The first frame of a slide is spelled out, so the player can start drawing at any slide
+        decoded = self.decoded if len(self.frames) > self.start else ()
+        values, self.decoded = self.diff(decoded, self.current)
+        self.frames.append([count, values])
+        self.previous = self.current
+
+    def mark_slide(self, slide_config):
+        if len(self.frames) > self.start:
+            self.slides.append({
+                "start": self.start,
+                "end": len(self.frames),
+                "loop": slide_config.loop,
+                "auto_next": slide_config.auto_next,
+                "playback_rate": slide_config.playback_rate,
+                "notes": slide_config.notes,
+            })
+        self.start = len(self.frames)
+        self.shapes.clear()
+
+    def save(self, path):
+        images = {paint_id: paint[1] for paint, paint_id in self.paints.items() if paint[0] is None}
+        frames = []
+        for count, values in self.frames:
+            values = list(values)
+            for k in range(0, len(values), 4):
+                if values[k] in images:
+                    values[k + 3] = round(min(values[k + 3] / self.image_alpha[images[values[k]]], 1.0), 3)
+            frames.append([count, values])
+        deck = {
+            "fps": self.camera.frame_rate,
+            "frame": [self.camera.frame_width, self.camera.frame_height, *self.camera.frame_center[:2].tolist()],
+            "background": self.camera.background_color.to_hex(),
+            "paths": list(self.paths),
+            "images": [png_data_url(pixels) for pixels in self.images],
+            "paints": [list(paint) for paint in self.paints],
+            "frames": frames,
+            "slides": self.slides,
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(deck, separators=(",", ":")))
+
+
+def write_page(title="Unit testing OpenFOAM code with foamUT"):
+    deck = json.loads(VECTOR_FILE.read_text())
+    ASSETS_DIR.mkdir(exist_ok=True)
+    shutil.copyfile(VECTOR_FILE, ASSETS_DIR / "vector.json")
+    shutil.copyfile(PLAYER, ASSETS_DIR / "player.js")
+    # One empty section per recorded slide, the player draws behind them
+    sections = "".join(
+        f'<section data-background-color="{deck["background"]}">'
+        + (f'<aside class="notes">{markup.escape(slide["notes"])}</aside>' if slide["notes"] else "")
+        + "</section>"
+        for slide in deck["slides"]
+    )
+    return PAGE.format(title=title, reveal=REVEAL, sections=sections, assets=ASSETS_DIR)
+
+
+if __name__ == "__main__":
+    sys.stdout.write(write_page())